@@ -26,15 +26,26 @@
 # 2020-11-28 fixes for first import (always include showdown round 4)
 # 2020-11-28 make external configuration file
 # 2020-12-21 v 0.1.1 - important bug fix for re-raises
+# 2026-10-15 output JSON is compact (no spaces after , and :) with non-ASCII text written as UTF-8
+#            and indented output uses 2 spaces; orjson is used for writing when installed (pip install orjson)
 
 
 import argparse
 import configparser
 import datetime
+import heapq
 import json
 import pytz
 import re
 import sys
+import zlib
+
+# use orjson to write the converted hands when it is installed, falling back to json
+# dumpOhh makes both produce the same bytes, so the output does not depend on which is available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # constants - DO NOT CHANGE
 VERSION = "0.1.1"
@@ -115,6 +126,38 @@ CURRENCY_ABBR = "CurrencyAbbr"
 PREFIX = "OutputPrefix"
 # end script level constants
 
+# compiled regular expressions for parsing the hand history text
+# compiled once here rather than on every line of every hand
+# patterns for text that always starts a line are anchored and used with match, so a line
+# that does not fit fails on its first characters instead of being retried at every offset
+# the unanchored searches are guarded by a plain substring check that any matching line
+# must contain, so most lines never reach the regular expression engine
+# a hand is the header line and the run of non-blank lines that follows it
+RE_HAND_BLOCK = re.compile(r"Hand #(\d*-\d*) - (\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\n?((?:[^\S\n]*\S.*\n?)*)")
+RE_TABLE = re.compile(r"^Table: (.*)$", re.MULTILINE)
+RE_SITE = re.compile(r"^Site: (.+)$")
+RE_GAME = re.compile(r"^Game: (\w+) ([^\(]+) \([^\)]+\)(.*)$")
+RE_BLINDS = re.compile(r"Blinds ([\d.]+)/([\d.]+)")
+RE_ANTE = re.compile(r"Ante ([\d.]+)")
+RE_SEAT = re.compile(r"^Seat (\d+): (\w+) \(([\d.]+)\)")
+RE_BUTTON = re.compile(r"(.+) has the dealer button")
+RE_POST = re.compile(r"^(\w+) (posts .*) ([\d.]+)$")
+RE_ROUND = re.compile(r"^\*\* ([^\*]+) \*\*")
+RE_NOTES = re.compile(r"\*\* \[([^\[]*)\]")
+RE_DEALT = re.compile(r"^Dealt to (\w+) \[([^\]]*)\]")
+RE_ALL_IN = re.compile(r"\(All-in\)")
+# one expression for all the other player actions, with each alternative wrapped in a named
+# group so that lastgroup on a match gives the kind of action (add, check, fold, bet, show, refund, win)
+RE_ACTION = re.compile(r"^(?P<player>\w+) (?:"
+                       r"(?P<add>adds (?P<added>[\d.]+) chip)|"
+                       r"(?P<check>checks)|"
+                       r"(?P<fold>folds)|"
+                       r"(?P<bet>(?P<does>bets|calls|raises to|brings in for) (?P<betAmount>[\d.]+))|"
+                       r"(?P<show>shows \[(?P<cards>[^\]]*)\])|"
+                       r"(?P<refund>refunded (?P<refundAmount>[\d.]+))|"
+                       r"(?P<win>(?:wins|splits).*Pot (?P<pot>\d+)? *\((?P<winAmount>[\d.]+)\)))")
+RE_FILENAME_CHARS = re.compile(r"[<>\:\"\/\\\|\?\*]")
+
 # configurable constants
 # these are constants that are meant to be configurable - they could be edited here,
 # or specified in a configuration file that is external to this script and checked for at run time
@@ -146,7 +189,8 @@ tables = {}   # the tables dictionary
               # LAST - string - hand number for the latest hand processed for this table
               #        LAST and LATEST are used to mark the "end" activity of players standing up
               #        they represent the last seen hand at the table from the processed logs
-              # HANDLE - absolute value of the hash value of the name of the table, as a string
+              # HANDLE - CRC32 checksum of the name of the table, as a string
+              #          unlike hash() this does not change from one run of the script to the next
               # OHH - list of hand histories, each in JSON following the OHH format
 
 # lookup tables
@@ -214,555 +258,609 @@ betVerbToAction = {
 # FUNCTIONS
 #
 
-# end of functions
-#
-#######################################################################################################################
+# turn a money amount as written in the hand history, like 150 or 0.25, into integer cents
+# amounts are added up and subtracted as cents while parsing a hand, so pots and re-raises
+# do not pick up floating point error, and only divided back down when stored in the OHH JSON
+# an amount with more than two decimal places cannot be held in cents, so it is rounded to the
+# nearest cent with a warning rather than being cut short without notice
+def parseCents(amount):
+    dot = amount.find('.')
+    if (dot < 0):
+        return int(amount) * 100
+    fraction = amount[dot + 1:]
+    cents = int(amount[:dot] or 0) * 100 + int((fraction + '00')[:2])
+    if (len(fraction) > 2):
+        if (fraction[2] >= '5'):
+            cents += 1
+        print("Warning: amount " + amount + " has more than two decimal places and was rounded to " +
+              str(cents / 100))
+    return cents
+
+# turn a hand header timestamp in the fixed YYYY-mm-dd HH:MM:SS form into a datetime
+# RE_HAND_BLOCK only accepts that exact form, so the fields can be sliced out by position
+# which is much cheaper than strptime parsing the format string for every hand
+def parseHandTime(stamp):
+    return datetime.datetime(int(stamp[0:4]), int(stamp[5:7]), int(stamp[8:10]),
+                             int(stamp[11:13]), int(stamp[14:16]), int(stamp[17:19]))
+
+# serialize one wrapped OHH object to UTF-8 JSON bytes
+# indented with 2 spaces if indent is set, which is the only indent orjson supports
+# the json fallback is given the separators and raw UTF-8 text that orjson writes
+def dumpOhh(wrappedOhh, indent):
+    if (orjson is not None):
+        return orjson.dumps(wrappedOhh, option=orjson.OPT_INDENT_2 if indent else 0)
+    if (indent):
+        return json.dumps(wrappedOhh, indent=2, separators=(",", ": "), ensure_ascii=False).encode('utf-8')
+    return json.dumps(wrappedOhh, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+# build the OHH JSON object for one player action
+# an amount goes ahead of the action name and any cards go after it
+# which is the key order the converted JSON has always been written in
+def makeAction(actionNumber, playerId, action, amount=None, cards=None):
+    if (amount is not None):
+        return {ACTION_NUMBER: actionNumber, PLAYER_ID: playerId, AMOUNT: amount, ACTION: action}
+    if (cards is not None):
+        return {ACTION_NUMBER: actionNumber, PLAYER_ID: playerId, ACTION: action, CARDS: cards}
+    return {ACTION_NUMBER: actionNumber, PLAYER_ID: playerId, ACTION: action}
+
+# read one hand history file and split it into hands
+# returns a list of (hand number, hand time, table name, hand text) tuples in the order found in the file
+# with the table name None if the hand has no Table: line
+def parseFile(fileName):
+    fileHands = []
+    with open(fileName, mode='r', encoding='utf-8') as f:
+        text = f.read()
+    for handBlock in RE_HAND_BLOCK.finditer(text):
+        handText = handBlock.group(3)
+        table = RE_TABLE.search(handText) if ("Table: " in handText) else None
+        fileHands.append((handBlock.group(1),
+                          parseHandTime(handBlock.group(2)),
+                          table.group(1) if (table != None) else None,
+                          handText))
+    return fileHands
+
+# parse the text of a single hand into an OHH JSON object
+# handNumber, handTimeUtc and table come from the hand header already picked out in the first pass
+# the rest of the hand information, player actions and pots come from handText
+# heroPlayer and currency are the settings from the command line or configuration file
+def parseHand(handNumber, handTimeUtc, table, handText, heroPlayer, currency):
+
+    # initialize the OHH JSON populating as many fields as possible and initializing key arrays
+    # like FLAGS, PLAYERS, ROUNDS, POTS
+    ohh = { SPEC_VERSION: OHH_VERSION,
+            SITE_NAME: '',
+            NETWORK_NAME: '',
+            INTERNAL_VERSION: HH_VERSION,
+            GAME_NUMBER: handNumber,
+            START_DATE_UTC : handTimeUtc,
+            TABLE_NAME : table,
+            TABLE_HANDLE : tables[table][HANDLE],
+            GAME_TYPE : "",
+            BET_LIMIT : {},
+            TABLE_SIZE : 10,
+            CURRENCY: currency,
+            DEALER_SEAT : 1,
+            SMALL_BLIND : 0,
+            BIG_BLIND : 0,
+            ANTE : 0,
+            FLAGS:[],
+            PLAYERS:[],
+            ROUNDS:[],
+            POTS:[]
+            }
+    players = []
+    playerIds = {}
+
+
+    # Set some Boolean flags to indicate what we already know about the Hand
+    # For instance processedSeats is set to False
+    # but once we know we have seenSeats we can assume we are either in or past that
+    # part of chat history and do not need to do text searches for Site, Game
+    # Also a placeholder for current Round
+    # processedSeats is a marker for the parsing logic to indicate we hace already
+    # encountered the players in the hands and accounted for them
+    # similar markers are used for cardsDealt and currentRound
+    # the roundCommit dictionary keeps track of what players have already committed to the pot
+    # so that re-raises can account for that in the raise action
+    # hasShowdownRound is set when the round with the showdown round id is made
+    # so the rounds do not need to be scanned for it at the end
+    # pots holds each pot by number already laid out as the OHH JSON pot object
+    # and potWinners maps pot number and player id to that player's entry in the pot's PLAYER_WINS list
+    processedSeats = False
+    cardsDealt = False
+    currentRound = None
+    heroPlaying = False
+    hasShowdownRound = False
+    winners = []
+    roundNumber = 0
+    actionNumber = 0
+    round = { CARDS:[], ACTIONS:[]}
+    appendAction = round[ACTIONS].append
+    pots = {}
+    potWinners = {}
+
+    # the match and search methods used on every line are bound to locals once per hand
+    # so the loop below does not look up the pattern global and its method for each line
+    matchSite = RE_SITE.match
+    matchGame = RE_GAME.match
+    matchSeat = RE_SEAT.match
+    searchButton = RE_BUTTON.search
+    matchPost = RE_POST.match
+    matchRound = RE_ROUND.match
+    searchNotes = RE_NOTES.search
+    matchDealt = RE_DEALT.match
+    matchAction = RE_ACTION.match
+    searchAllIn = RE_ALL_IN.search
+    roundCommit = {}
+
+
+    # the hand text keeps the newline after its last line, so splitting on newlines
+    # leaves an empty string at the end which is skipped along with any other empty line
+    for line in handText.split('\n'):
+        if (line == ''):
+            continue
+        if (not cardsDealt):
+            if (not processedSeats):
+                # the text match to look for the site name
+                site = matchSite(line)
+                if (site != None):
+                    ohh[SITE_NAME] = site.group(1)
+                    ohh[NETWORK_NAME] = site.group(1)
+                    continue
+
+                # the text match to look for the game type
+                game = matchGame(line)
+                if (game != None):
+                    structure = game.group(1)
+                    variant = game.group(2)
+                    terms = game.group(3)
+
+                    if (variant in games):
+                        ohh[GAME_TYPE] = games[variant]
+                    else:
+                        print("Game variant not found: " + variant + " for hand: " + handNumber)
+
+                    if (structure in structures):
+                        ohh[BET_LIMIT][BET_TYPE] = structures[structure]
+                    else:
+                        print("Structure not found: " + structure + " for hand: " + handNumber)
+
+                    blinds = RE_BLINDS.search(terms)
+                    if (blinds != None):
+                        ohh[SMALL_BLIND] = parseCents(blinds.group(1)) / 100
+                        ohh[BIG_BLIND] = parseCents(blinds.group(2)) / 100
+
+                    ante = RE_ANTE.search(terms)
+                    if (ante != None):
+                        ohh[ANTE] = parseCents(ante.group(1)) / 100
 
-lineCount = 0
-sessionDate = datetime.datetime.now().strftime("%m/%d/%Y")
-
-# look for configuration file and use those settings
-# then load player roster if specified and found
-# finally if there is an EmailExportFile specified, open that,
-# parse each line, and either update or create a resolvedScreenName dictionary entry using
-# the combination of ScreenName and email on each line of that file
-# the export file format is that which Mavens produces from the
-# Accounts tab "Export > Emails With Names" option
-config = configparser.ConfigParser(defaults=DEFAULT_OPTIONS)
-try:
-    with open(OPTIONS_FILE,encoding="utf-8") as optionsFile:
-        config.read_file(optionsFile)
-
-except IOError:
-    optionInformation = "Could not read " + OPTIONS_FILE + ". Using default values from script."
-
-
-
-# get and parse command line arguments
-# then process some key ones straight away
-# namely, if roster option is used, dump the player roster and go
-# if email option is activated, check for presence of password command line argument
-# if not there prompt for it
-parser = argparse.ArgumentParser(description=
-                                 ('Convert Poker Mavens hand history to JSON.' +
-                                  ' v ' + VERSION))
-parser.add_argument('-c','--currency', action="store",dest="currency",default=config.get('DEFAULT',CURRENCY_ABBR),
-                    help=("Three letter currency code to specify in converted hand histories. " +
-                            "Default: " + config.get('DEFAULT',CURRENCY_ABBR))
-                    )
-parser.add_argument('-i','--indent', action="store_true",dest="indent",default=False,
-                    help="Indent JSON output. Violates specified .ohh file format, but useful for debugging.")
-parser.add_argument('-p','--player', action="store",dest="player",default=config.get('DEFAULT',HERO_NAME),
-                    help="The screen name for our hero player. Default: " + config.get('DEFAULT',HERO_NAME))
-parser.add_argument('-t','--timezone', action="store",dest="timezone",default=config.get('DEFAULT',TIMEZONE_TEXT),
-                    help=("Timezone specification for hand history times. In form \"Asia/Macau\". " +
-                            " For list see https://en.wikipedia.org/wiki/List_of_tz_database_time_zones. " +
-                            "Default: " + config.get('DEFAULT',TIMEZONE_TEXT) )
-                   )
-parser.add_argument('file', type=argparse.FileType('r'), nargs='*',help="plain text files of Poker Mavens hand histories to process.")
-args = parser.parse_args()
-
-lastHandTime = datetime.datetime.now()
-heroPlayer = args.player
-
-currency = args.currency
-if (len(currency) != 3):
-    print("Currency code must have three characters. Defaulting back to " + DEFAULT_CURRENCY)
-    currency = DEFAULT_CURRENCY
-
-timezone = pytz.timezone(args.timezone)
-
-numArg = len(args.file)
-if (numArg == 0):
-    print("Must provide a name of a log file to process.")
-else:
-    # process each file listed on the command line
-    # first loop through is just to parse and get each hand separated, and get basic hand
-    # info into the hands dictionary
-    # basic hand info is hand number, local hand number, hand time, and table
-    # everything else goes into TEXT
-    for fh in args.file:
-        f = open(fh.name, mode='r', encoding='utf-8')
-        line = f.readline()
-        while (len(line) != 0):
-            matches = re.search("Hand #(\d*-\d*) - (.*)$",line)
-            if (matches != None):
-                handNumber = matches.group(1)
-                handTime = datetime.datetime.strptime(matches.group(2),"%Y-%m-%d %H:%M:%S")
-                hands[handNumber] = {
-                                   DATETIME: handTime,
-                                   TEXT: ''}
-                line = f.readline()
-                while (not (line.strip() == '')):
-                    table = re.search("Table: (.*)$",line)
-                    if (table != None):
-                        tableName = table.group(1)
-                        if (not tableName in tables):
-                            tables[tableName] = {COUNT: 0, LATEST: "", OHH:[] }
-                            tables[tableName][HANDLE] = str(abs(hash(tableName)))
-                        hands[handNumber][TABLE] = tableName
-                    hands[handNumber][TEXT] = hands[handNumber][TEXT] + line
-                    line = f.readline()
-            else:
-                line = f.readline()
-        f.close()
-
-    handNumber = ""
-    handTime = datetime.datetime.now()
-
-    # now that we have all hands from all the files,
-    # use the timestamps of the imported hands to process them in chronological order
-    # this is the place for processing the text of each hand and look for player actions
-    for handNumber in sorted(hands.keys(), key=lambda hand: hands[hand][DATETIME] ):
-
-        # Get important hand and table header info and put hand time in the YYYY-mm-ddThh:mm:ssZ ISO
-        # format that is expected by the OHH spec
-        # being sure to reference back to the timezone as specified in command line
-        # or configuration files
-        handTime = timezone.localize(hands[handNumber][DATETIME])
-        handTimeUtc = handTime.astimezone(pytz.utc).strftime("%Y-%m-%dT%TZ")
-        # print(handNumber) #DEBUG
-        table = hands[handNumber][TABLE]
-        tables[table][COUNT] += 1
-        tables[table][LATEST] = handTime
-        tables[table][LAST] = handNumber
-        lastHandTime = handTime
-        # print(handTime) # DEBUG
-
-        # initialize the OHH JSON populating as many fields as possible and initializing key arrays
-        # like FLAGS, PLAYERS, ROUNDS, POTS
-        ohh = { SPEC_VERSION: OHH_VERSION,
-                SITE_NAME: '',
-                NETWORK_NAME: '',
-                INTERNAL_VERSION: HH_VERSION,
-                GAME_NUMBER: handNumber,
-                START_DATE_UTC : handTimeUtc,
-                TABLE_NAME : table,
-                TABLE_HANDLE : tables[table][HANDLE],
-                GAME_TYPE : "",
-                BET_LIMIT : {},
-                TABLE_SIZE : 10,
-                CURRENCY: currency,
-                DEALER_SEAT : 1,
-                SMALL_BLIND : 0,
-                BIG_BLIND : 0,
-                ANTE : 0,
-                FLAGS:[],
-                PLAYERS:[],
-                ROUNDS:[],
-                POTS:[]
-                }
-        players = []
-        playerIds = {}
-
-
-        # Set some Boolean flags to indicate what we already know about the Hand
-        # For instance processedSeats is set to False
-        # but once we know we have seenSeats we can assume we are either in or past that
-        # part of chat history and do not need to do text searches for Site, Game
-        # Also a placeholder for current Round
-        # processedSeats is a marker for the parsing logic to indicate we hace already
-        # encountered the players in the hands and accounted for them
-        # similar markers are used for cardsDealt and currentRound
-        # the roundCommit dictionary keeps track of what players have already committed to the pot
-        # so that re-raises can account for that in the raise action
-        processedSeats = False
-        cardsDealt = False
-        currentRound = None
-        heroPlaying = False
-        winners = []
-        roundNumber = 0
-        actionNumber = 0
-        round = { CARDS:[], ACTIONS:[]}
-        pots = {}
-        roundCommit = {}
-
-
-        for line in hands[handNumber][TEXT].splitlines():
-            if (not cardsDealt):
-                if (not processedSeats):
-                    # the text match to look for the site name
-                    site = re.search("Site: (.+)$",line)
-                    if (site != None):
-                        ohh[SITE_NAME] = site.group(1)
-                        ohh[NETWORK_NAME] = site.group(1)
-                        continue
-
-                    # the text match to look for the game type
-                    game = re.search("Game: (\w+) ([^\(]+) \([^\)]+\)(.*)$",line)
-                    if (game != None):
-                        structure = game.group(1)
-                        variant = game.group(2)
-                        terms = game.group(3)
-
-                        if (variant in games):
-                            ohh[GAME_TYPE] = games[variant]
-                        else:
-                            print("Game variant not found: " + variant + " for hand: " + handNumber)
-
-                        if (structure in structures):
-                            ohh[BET_LIMIT][BET_TYPE] = structures[structure]
-                        else:
-                            print("Structure not found: " + structure + " for hand: " + handNumber)
-
-                        blinds = re.search("Blinds ([\d.]+)/([\d.]+)", terms)
-                        if (blinds != None):
-                            ohh[SMALL_BLIND] = float(blinds.group(1))
-                            ohh[BIG_BLIND] = float(blinds.group(2))
-
-                        ante = re.search("Ante ([\d.]+)", terms)
-                        if (ante != None):
-                            ohh[ANTE] = float(ante.group(1))
-
-                        continue
-
-                # the text match to look for a seated player and see their chip amount
-                # specifically for the hero player, make sure that the player is not
-                # waiting or sitting out, and then mark the hand appropriately
-                # for the ID for Hero or the Flag for Observed
-                seat = re.search("Seat (\d+): (\w+) \(([\d.]+)\)",line)
-                if (seat != None):
-                    seatNumber = int(seat.group(1))
-                    player = seat.group(2)
-                    stack = float(seat.group(3))
-                    players.append({ID:seatNumber,
-                                    SEAT:seatNumber,
-                                    NAME:player,
-                                    DISPLAY:player,
-                                    STARTING_STACK: stack})
-                    playerIds[player] = seatNumber
-                    if (player == heroPlayer):
-                        ohh[HERO] = seatNumber
-                        sitOrWait = re.search("(sitting|waiting)", line)
-                        if (sitOrWait is None):
-                            heroPlaying = True
-                    processedSeats = True
                     continue
 
-                # the text to match for an add on
-                buttonSpecified = re.search("(.+) has the dealer button",line)
-                if (buttonSpecified != None):
-                    buttonPlayer = buttonSpecified.group(1)
-                    ohh[DEALER_SEAT] = playerIds[buttonPlayer]
-
-            # the text to match for a post
-            # this also indicates that the dealing is happening and we should
-            # move to the phase of assembling rounds of actions
-            # currently do not use the OHH action of "Post Extra Blind" or "Post Dead"
-            #TODO test scenarios with dead blind or additional blind
-            #TODO Check if an allin post results in comment on the post line itself
-            post = re.search("^(\w+) (posts .*) ([\d.]+)$",line)
-            if (post != None):
-                player = post.group(1)
-                type = post.group(2)
-                amount = float(post.group(3))
-                cardsDealt = True
+            # the text match to look for a seated player and see their chip amount
+            # specifically for the hero player, make sure that the player is not
+            # waiting or sitting out, and then mark the hand appropriately
+            # for the ID for Hero or the Flag for Observed
+            # player names are interned as they key the playerIds and roundCommit lookups for every action
+            seat = matchSeat(line)
+            if (seat != None):
+                seatNumber = int(seat.group(1))
+                player = sys.intern(seat.group(2))
+                stack = parseCents(seat.group(3)) / 100
+                players.append({ID:seatNumber,
+                                SEAT:seatNumber,
+                                NAME:player,
+                                DISPLAY:player,
+                                STARTING_STACK: stack})
+                playerIds[player] = seatNumber
+                if (player == heroPlayer):
+                    ohh[HERO] = seatNumber
+                    if ("sitting" not in line and "waiting" not in line):
+                        heroPlaying = True
+                processedSeats = True
+                continue
+
+            # the text to match for an add on
+            buttonSpecified = searchButton(line) if (" has the dealer button" in line) else None
+            if (buttonSpecified != None):
+                buttonPlayer = buttonSpecified.group(1)
+                ohh[DEALER_SEAT] = playerIds[buttonPlayer]
+
+        # the text to match for a post
+        # this also indicates that the dealing is happening and we should
+        # move to the phase of assembling rounds of actions
+        # currently do not use the OHH action of "Post Extra Blind" or "Post Dead"
+        #TODO test scenarios with dead blind or additional blind
+        #TODO Check if an allin post results in comment on the post line itself
+        post = matchPost(line) if (" posts " in line) else None
+        if (post != None):
+            player = post.group(1)
+            type = post.group(2)
+            amount = parseCents(post.group(3))
+            cardsDealt = True
+            if (currentRound is None):
+                actionNumber = 0
+                round[ID] = (roundNumber)
+                currentRound = firstRounds[ohh[GAME_TYPE]]
+                round[STREET] = currentRound
+                roundCommit = {}
+                for p in playerIds:
+                    roundCommit[p] = 0
+            playerId = playerIds[player]
+            if (type == POSTS_BOTH_BLINDS):
+                appendAction(makeAction(actionNumber, playerId, "Post SB", amount=ohh[SMALL_BLIND]))
+                actionNumber += 1
+                appendAction(makeAction(actionNumber, playerId, "Post BB", amount=ohh[BIG_BLIND]))
+            else:
+                appendAction(makeAction(actionNumber, playerId, postTypes[type], amount=amount / 100))
+            actionNumber += 1
+
+        # look for round markers
+        # note that cards dealt are melded together with opening round and do not necessarily mark a new round
+        roundMarker = matchRound(line)
+        if (roundMarker != None):
+            label = roundMarker.group(1)
+            notes = searchNotes(line)
+            # should not happen that we get to this point without a post
+            # but let's anticipate that it could happen and check for that when
+            # processing hole cards
+            if (roundMarker == HOLE_CARDS):
                 if (currentRound is None):
                     actionNumber = 0
                     round[ID] = (roundNumber)
                     currentRound = firstRounds[ohh[GAME_TYPE]]
                     round[STREET] = currentRound
-                    roundCommit = {}
-                    for p in playerIds:
-                        roundCommit[p] = 0
-                action = {}
-                if (type == POSTS_BOTH_BLINDS):
-                    action[ACTION_NUMBER] = actionNumber
-                    action[PLAYER_ID] = playerIds[player]
-                    action[AMOUNT] = ohh[SMALL_BLIND]
-                    action[ACTION] = "Post SB"
-                    round[ACTIONS].append(action)
-                    actionNumber += 1
                     action = {}
-                    action[ACTION_NUMBER] = actionNumber
-                    action[PLAYER_ID] = playerIds[player]
-                    action[AMOUNT] = ohh[BIG_BLIND]
-                    action[ACTION] = "Post BB"
-                    round[ACTIONS].append(action)
-                else:
-                    action[ACTION_NUMBER] = actionNumber
-                    action[PLAYER_ID] = playerIds[player]
-                    action[AMOUNT] = amount
-                    action[ACTION] = postTypes[type]
-                    round[ACTIONS].append(action)
-                actionNumber += 1
-
-            # look for round markers
-            # note that cards dealt are melded together with opening round and do not necessarily mark a new round
-            roundMarker = re.search("\*\* ([^\*]+) \*\*",line)
-            if (roundMarker != None):
-                label = roundMarker.group(1)
-                notes = re.search("\*\* \[([^\[]*)\]", line)
-                # should not happen that we get to this point without a post
-                # but let's anticipate that it could happen and check for that when
-                # processing hole cards
-                if (roundMarker == HOLE_CARDS):
-                    if (currentRound is None):
-                        actionNumber = 0
-                        round[ID] = (roundNumber)
-                        currentRound = firstRounds[ohh[GAME_TYPE]]
-                        round[STREET] = currentRound
-                        action = {}
-                        roundCommit = {}
-                        for p in playerIds:
-                            roundCommit[p] = 0
-                    continue
-                elif (label in makeNewRound):
-                    # make new round
-                    # we need to add current round object to the OHH JSON
-                    # and make a clean one
-                    # increment round number and reset action number
-                    ohh[ROUNDS].append(round)
-                    round = {}
-                    roundNumber += 1
-                    actionNumber = 0
-                    thisRound = makeNewRound[label]
-                    currentRound = thisRound
-                    round[ID] = (roundNumber)
-                    round[STREET] = currentRound
-                    round[CARDS] = []
-                    round[ACTIONS] = []
-                    roundCommit = {}
-                    for p in playerIds:
-                        roundCommit[p] = 0
-
-                    if (notes is not None):
-                        for card in notes.group(1).split():
-                            round[CARDS].append(card)
-                elif (SHOW_DOWN in label):
-                    ohh[ROUNDS].append(round)
-                    round = {}
-                    roundNumber += 1
-                    actionNumber = 0
-                    currentRound = label
-                    round[ID] = (roundNumber)
-                    round[STREET] = makeNewRound[SHOW_DOWN]
-                    round[CARDS] = []
-                    round[ACTIONS] = []
                     roundCommit = {}
                     for p in playerIds:
                         roundCommit[p] = 0
-                else:
-                    continue
-
-            # the text to match for an add on
-            addOn = re.search("(\w+) adds ([\d.]+) chip",line)
-            if (addOn != None):
-                player = addOn.group(1)
-                additional = float(addOn.group(2))
-                if (currentRound is not None and player in playerIds):
-                    action={}
-                    action[ACTION_NUMBER] = actionNumber
-                    action[PLAYER_ID] = (playerIds[player])
-                    action[AMOUNT] = additional
-                    action[ACTION] = "Added Chips"
-                    round[ACTIONS].append(action)
-                    actionNumber += 1
-                continue
-
-            # the text to match for cards dealt
-            dealt = re.search("Dealt to (\w+) \[([^\]]*)\]",line)
-            if (dealt != None):
-                player = dealt.group(1)
-                cards = dealt.group(2)
-                action = {}
-                action[ACTION_NUMBER] = actionNumber
-                action[PLAYER_ID] = playerIds[player]
-                action[ACTION] = "Dealt Cards"
-                action[CARDS] = []
-                for card in cards.split():
-                    action[CARDS].append(card)
-                round[ACTIONS].append(action)
-                actionNumber += 1
-                continue
-
-            # the text to match for folds
-            checks = re.search("(\w+) checks",line)
-            if (checks != None):
-                player = checks.group(1)
-                action = {}
-                action[ACTION_NUMBER] = actionNumber
-                action[PLAYER_ID] = playerIds[player]
-                action[ACTION] = "Check"
-                round[ACTIONS].append(action)
-                actionNumber += 1
                 continue
-
-            # the text to match for checks
-            folds = re.search("(\w+) folds",line)
-            if (folds != None):
-                player = folds.group(1)
-                action = {}
-                action[ACTION_NUMBER] = actionNumber
-                action[PLAYER_ID] = playerIds[player]
-                action[ACTION] = "Fold"
-                round[ACTIONS].append(action)
-                actionNumber += 1
-                continue
-
-            # the text to match for betting
-            # important to look for All-in indicator and mark the action
-            # as such inthe hand history
-            bet = re.search("(\w+) (bets|calls|raises to|brings in for) ([\d.]+)",line)
-            if (bet != None):
-                player = bet.group(1)
-                does =  bet.group(2)
-                amount = float(bet.group(3))
-                action={}
-                action[ACTION_NUMBER] = actionNumber
-                action[PLAYER_ID] = playerIds[player]
-                if (does == "raises to"):
-                    amount = amount - roundCommit[player]
-                roundCommit[player] += amount
-                action[AMOUNT] = amount
-                action[ACTION] = betVerbToAction[does]
-                allIn = re.search("\(All-in\)",line)
-                if (allIn is not None):
-                    action[IS_ALL_IN] = True
-                round[ACTIONS].append(action)
-                actionNumber += 1
+            elif (label in makeNewRound):
+                # make new round
+                # we need to add current round object to the OHH JSON
+                # and make a clean one
+                # increment round number and reset action number
+                ohh[ROUNDS].append(round)
+                round = {}
+                roundNumber += 1
+                actionNumber = 0
+                thisRound = makeNewRound[label]
+                currentRound = thisRound
+                round[ID] = (roundNumber)
+                if (roundNumber == SHOWDOWN_ROUND_ID):
+                    hasShowdownRound = True
+                round[STREET] = currentRound
+                round[CARDS] = []
+                round[ACTIONS] = []
+                appendAction = round[ACTIONS].append
+                roundCommit = {}
+                for p in playerIds:
+                    roundCommit[p] = 0
+
+                if (notes is not None):
+                    round[CARDS] = notes.group(1).split()
+            elif (SHOW_DOWN in label):
+                ohh[ROUNDS].append(round)
+                round = {}
+                roundNumber += 1
+                actionNumber = 0
+                currentRound = label
+                round[ID] = (roundNumber)
+                if (roundNumber == SHOWDOWN_ROUND_ID):
+                    hasShowdownRound = True
+                round[STREET] = makeNewRound[SHOW_DOWN]
+                round[CARDS] = []
+                round[ACTIONS] = []
+                appendAction = round[ACTIONS].append
+                roundCommit = {}
+                for p in playerIds:
+                    roundCommit[p] = 0
+            else:
                 continue
 
-            # the text to match for showing card
-            shows = re.search("(\w+) shows \[([^\]]*)\]",line)
-            if (shows != None):
-                player = shows.group(1)
-                cards = shows.group(2)
-                action = {}
-                action[ACTION_NUMBER] = actionNumber
-                action[PLAYER_ID] = playerIds[player]
-                action[ACTION] = "Shows Cards"
-                action[CARDS] = []
-                for card in cards.split():
-                    action[CARDS].append(card)
-                round[ACTIONS].append(action)
+        # the text to match for cards dealt
+        dealt = matchDealt(line)
+        if (dealt != None):
+            player = dealt.group(1)
+            cards = dealt.group(2)
+            appendAction(makeAction(actionNumber, playerIds[player], "Dealt Cards", cards=cards.split()))
+            actionNumber += 1
+            continue
+
+        # the remaining player actions are all matched by the one combined expression
+        # and the name of the alternative that matched says which action it is
+        playerAction = matchAction(line)
+        if (playerAction is None):
+            continue
+        player = playerAction.group("player")
+        kind = playerAction.lastgroup
+
+        # the text to match for an add on
+        if (kind == "add"):
+            additional = parseCents(playerAction.group("added"))
+            if (currentRound is not None and player in playerIds):
+                appendAction(makeAction(actionNumber, playerIds[player], "Added Chips", amount=additional / 100))
                 actionNumber += 1
-                continue
-
-            # the text to match for a refunded bet
-            # during initial development, it was not clear how to handle refunded bets
-            # since the OHH spec does not mention these
-            # so the initial approach was to add these into the pot so that the rewarded pot
-            # added up to what was bet
-            # however on initial testing, became clear that this is not an issue
-            # PT4 on import accounts for uncalled bets and does not include them
-            # in pot calculations
-            # so the pot calculation here is commented out
-            #TODO remove this refunded processing entirely if truly not needed
-            refunded = re.search("(\w+) refunded ([\d.]+)",line)
-            if (refunded != None):
-                player = refunded.group(1)
-                amount = float(refunded.group(2))
-                playerId = playerIds[player]
-                potNumber = 0
-                #if (not potNumber in pots):
-                #    pots[potNumber] = {NUMBER: potNumber, AMOUNT: 0, RAKE: 0, PLAYER_WINS: {}}
-                #    if (not playerId in pots[potNumber][PLAYER_WINS]):
-                #        pots[potNumber][PLAYER_WINS][playerId] = {PLAYER_ID: playerId, WIN_AMOUNT: 0, CONTRIBUTED_RAKE:0}
-                #pots[potNumber][AMOUNT] += amount
-                #pots[potNumber][PLAYER_WINS][playerId][WIN_AMOUNT] += amount
-                continue
-
-            # the text to match for cards shows
-            # the text to check for a win
-            # the winners array is used in later logic to check
-            # for the existence of showdown round 4 in each OHH object
-            winner = re.search("(\w+) (wins|splits).*Pot (\d+)? *\(([\d.]+)\)",line)
-            if (winner != None):
-                player = winner.group(1)
-                playerId = playerIds[player]
-                winners.append(playerId)
-                potNumber = int(winner.group(3)) if (winner.group(3) is not None) else 0
-                win = float(winner.group(4))
-                if (not potNumber in pots):
-                    pots[potNumber] = {NUMBER: potNumber, AMOUNT: 0, RAKE: 0, PLAYER_WINS: {}}
-                if (not playerId in pots[potNumber][PLAYER_WINS]):
-                    pots[potNumber][PLAYER_WINS][playerId] = {PLAYER_ID: playerId, WIN_AMOUNT: 0, CONTRIBUTED_RAKE:0}
-                pots[potNumber][AMOUNT] += win
-                pots[potNumber][PLAYER_WINS][playerId][WIN_AMOUNT] += win
-
-        # Need to step through the pots dictionary of dictionaries
-        # and rewrite each pot as a potObject that is then added to the POTS list in the OHH JSON
-        # so that the OHH JSON is as expected
-        # then we can add that to the OHH JSON
-        for potNumber in pots.keys():
-            amt = pots[potNumber][AMOUNT]
-            rake = pots[potNumber][RAKE]
-            potObj = {NUMBER: potNumber,
-                      AMOUNT: amt,
-                      RAKE: rake,
-                      PLAYER_WINS: []
-                      }
-            for playerId in pots[potNumber][PLAYER_WINS]:
-                winAmt = pots[potNumber][PLAYER_WINS][playerId][WIN_AMOUNT]
-                rakeContribution = pots[potNumber][PLAYER_WINS][playerId][CONTRIBUTED_RAKE]
-                playerWinObj = {PLAYER_ID:playerId,
-                                WIN_AMOUNT: winAmt,
-                                CONTRIBUTED_RAKE: rakeContribution
-                                }
+            continue
+
+        # the text to match for checks
+        if (kind == "check"):
+            appendAction(makeAction(actionNumber, playerIds[player], "Check"))
+            actionNumber += 1
+            continue
+
+        # the text to match for folds
+        if (kind == "fold"):
+            appendAction(makeAction(actionNumber, playerIds[player], "Fold"))
+            actionNumber += 1
+            continue
+
+        # the text to match for betting
+        # important to look for All-in indicator and mark the action
+        # as such inthe hand history
+        if (kind == "bet"):
+            does =  playerAction.group("does")
+            amount = parseCents(playerAction.group("betAmount"))
+            playerId = playerIds[player]
+            if (does == "raises to"):
+                amount = amount - roundCommit[player]
+            roundCommit[player] += amount
+            action = makeAction(actionNumber, playerId, betVerbToAction[does], amount=amount / 100)
+            allIn = searchAllIn(line)
+            if (allIn is not None):
+                action[IS_ALL_IN] = True
+            appendAction(action)
+            actionNumber += 1
+            continue
+
+        # the text to match for showing card
+        if (kind == "show"):
+            cards = playerAction.group("cards")
+            appendAction(makeAction(actionNumber, playerIds[player], "Shows Cards", cards=cards.split()))
+            actionNumber += 1
+            continue
+
+        # the text to match for a refunded bet
+        # during initial development, it was not clear how to handle refunded bets
+        # since the OHH spec does not mention these
+        # so the initial approach was to add these into the pot so that the rewarded pot
+        # added up to what was bet
+        # however on initial testing, became clear that this is not an issue
+        # PT4 on import accounts for uncalled bets and does not include them
+        # in pot calculations
+        # so the pot calculation here is commented out
+        #TODO remove this refunded processing entirely if truly not needed
+        if (kind == "refund"):
+            amount = parseCents(playerAction.group("refundAmount"))
+            playerId = playerIds[player]
+            potNumber = 0
+            #if (not potNumber in pots):
+            #    pots[potNumber] = {NUMBER: potNumber, AMOUNT: 0, RAKE: 0, PLAYER_WINS: {}}
+            #    if (not playerId in pots[potNumber][PLAYER_WINS]):
+            #        pots[potNumber][PLAYER_WINS][playerId] = {PLAYER_ID: playerId, WIN_AMOUNT: 0, CONTRIBUTED_RAKE:0}
+            #pots[potNumber][AMOUNT] += amount
+            #pots[potNumber][PLAYER_WINS][playerId][WIN_AMOUNT] += amount
+            continue
+
+        # the text to match for cards shows
+        # the text to check for a win
+        # the winners array is used in later logic to check
+        # for the existence of showdown round 4 in each OHH object
+        if (kind == "win"):
+            playerId = playerIds[player]
+            winners.append(playerId)
+            pot = playerAction.group("pot")
+            potNumber = int(pot) if (pot is not None) else 0
+            win = parseCents(playerAction.group("winAmount"))
+            if (not potNumber in pots):
+                pots[potNumber] = {NUMBER: potNumber, AMOUNT: 0, RAKE: 0, PLAYER_WINS: []}
+                potWinners[potNumber] = {}
+            potObj = pots[potNumber]
+            playerWinObj = potWinners[potNumber].get(playerId)
+            if (playerWinObj is None):
+                playerWinObj = {PLAYER_ID: playerId, WIN_AMOUNT: 0, CONTRIBUTED_RAKE:0}
+                potWinners[potNumber][playerId] = playerWinObj
                 potObj[PLAYER_WINS].append(playerWinObj)
-
-            ohh[POTS].append(potObj)
-
-
-        # final cleanup and assignments before pushing the JSON onto the list for the table
-        # including requirement from the OHH spec that there MUST be a round 4 (showdown)
-        # only going to check this if the game is Hold 'Em or Omaha (does not make sense for Stud)
-        # and prepared to remove this if the spec is adjusted for what appears to be a mistake
-        if (not heroPlaying):
-            ohh[FLAGS].append(OBSERVED)
-        ohh[PLAYERS] = players
-        ohh[ROUNDS].append(round)
-        # now check if there should be a round 4 according to spec but it is absent
-        # and if not there then add it
-        # error out if somehow more than one winner (there should have been a showdown to produce
-        # more than one winner)
-        if (ohh[GAME_TYPE] in requireShowdown):
-            hasShowdownRound = False
-            for round in ohh[ROUNDS]:
-                if (round[ID] == SHOWDOWN_ROUND_ID):
-                    hasShowdownRound = True
-            if (not hasShowdownRound):
-                if (len(winners) > 1):
-                    print ("Error: Hand Number " + ohh[GAME_NUMBER] + " appears to be missing a showdown round while having more than one winner.")
-                elif (len(winners) == 0):
-                    print ("Error: Hand Number " + ohh[GAME_NUMBER] + " appears there are no winners.")
-                else:
-                    round = {}
-                    actionNumber = 0
-                    round[ID] = (SHOWDOWN_ROUND_ID)
-                    round[STREET] = makeNewRound[SHOW_DOWN]
-                    round[CARDS] = []
-                    round[ACTIONS] = []
-                    action = {}
-                    action[ACTION_NUMBER] = actionNumber
-                    action[PLAYER_ID] = winners[0]
-                    action[ACTION] = "Mucks Cards"
-                    round[ACTIONS].append(action)
-                ohh[ROUNDS].append(round)
-
-        tables[table][OHH].append(ohh)
-
-
-    # finally step through each table and produce an output file
-    # with one OHH JSON object on a line
-    # separated from one another by empty lines as specified by PT4 for import
-    # UNLESS the -i or --indent flag was used in which case the JSON for
-    # each OHH object will be indented for ease of reading and debugging
-    for table in tables.keys():
-        print("Table: " + table + " Processed hands:" +str(tables[table][COUNT]))
-        print("\tLatest: " + tables[table][LATEST].strftime("%T %m/%d/%Y"))
-        fileName = (config.get('DEFAULT',PREFIX) + tables[table][LATEST].strftime("-%Y-%m-%d-") +
-                     re.sub("[<>\:\"\/\\\|\?\*]",'_', table ) + ".ohh")
-        f = open(fileName, "w")
-        for ohh in tables[table][OHH]:
-            wrapped_ohh = {}
-            wrapped_ohh[OHH] = ohh
-            if (args.indent):
-                f.write(json.dumps(wrapped_ohh, indent=4))
+            potObj[AMOUNT] += win
+            playerWinObj[WIN_AMOUNT] += win
+
+    # the pots dictionary already holds each pot in the form the OHH JSON expects
+    # so all that is left is turning the amounts from cents back into chips
+    for potObj in pots.values():
+        potObj[AMOUNT] /= 100
+        for playerWinObj in potObj[PLAYER_WINS]:
+            playerWinObj[WIN_AMOUNT] /= 100
+    ohh[POTS] = list(pots.values())
+
+
+    # final cleanup and assignments before pushing the JSON onto the list for the table
+    # including requirement from the OHH spec that there MUST be a round 4 (showdown)
+    # only going to check this if the game is Hold 'Em or Omaha (does not make sense for Stud)
+    # and prepared to remove this if the spec is adjusted for what appears to be a mistake
+    if (not heroPlaying):
+        ohh[FLAGS].append(OBSERVED)
+    ohh[PLAYERS] = players
+    ohh[ROUNDS].append(round)
+    # now check if there should be a round 4 according to spec but it is absent
+    # and if not there then add it
+    # error out if somehow more than one winner (there should have been a showdown to produce
+    # more than one winner)
+    if (ohh[GAME_TYPE] in requireShowdown):
+        if (not hasShowdownRound):
+            if (len(winners) > 1):
+                print ("Error: Hand Number " + ohh[GAME_NUMBER] + " appears to be missing a showdown round while having more than one winner.")
+            elif (len(winners) == 0):
+                print ("Error: Hand Number " + ohh[GAME_NUMBER] + " appears there are no winners.")
             else:
-                f.write(json.dumps(wrapped_ohh))
-            f.write("\n")
-            f.write("\n")
+                round = {}
+                actionNumber = 0
+                round[ID] = (SHOWDOWN_ROUND_ID)
+                round[STREET] = makeNewRound[SHOW_DOWN]
+                round[CARDS] = []
+                round[ACTIONS] = []
+                round[ACTIONS].append(makeAction(actionNumber, winners[0], "Mucks Cards"))
+            ohh[ROUNDS].append(round)
+
+    return ohh
+
+# the script itself: read settings and arguments, split the files into hands,
+# convert each hand in time order and write one output file per table
+# kept in a function so that importing this module does not run it
+def main():
+    lineCount = 0
+    sessionDate = datetime.datetime.now().strftime("%m/%d/%Y")
+
+    # look for configuration file and use those settings
+    # then load player roster if specified and found
+    # finally if there is an EmailExportFile specified, open that,
+    # parse each line, and either update or create a resolvedScreenName dictionary entry using
+    # the combination of ScreenName and email on each line of that file
+    # the export file format is that which Mavens produces from the
+    # Accounts tab "Export > Emails With Names" option
+    config = configparser.ConfigParser(defaults=DEFAULT_OPTIONS)
+    try:
+        with open(OPTIONS_FILE,encoding="utf-8") as optionsFile:
+            config.read_file(optionsFile)
+
+    except IOError:
+        optionInformation = "Could not read " + OPTIONS_FILE + ". Using default values from script."
+
+
+
+    # get and parse command line arguments
+    # then process some key ones straight away
+    # namely, if roster option is used, dump the player roster and go
+    # if email option is activated, check for presence of password command line argument
+    # if not there prompt for it
+    parser = argparse.ArgumentParser(description=
+                                     ('Convert Poker Mavens hand history to JSON.' +
+                                      ' v ' + VERSION))
+    parser.add_argument('-c','--currency', action="store",dest="currency",default=config.get('DEFAULT',CURRENCY_ABBR),
+                        help=("Three letter currency code to specify in converted hand histories. " +
+                                "Default: " + config.get('DEFAULT',CURRENCY_ABBR))
+                        )
+    parser.add_argument('-i','--indent', action="store_true",dest="indent",default=False,
+                        help="Indent JSON output. Violates specified .ohh file format, but useful for debugging.")
+    parser.add_argument('-p','--player', action="store",dest="player",default=config.get('DEFAULT',HERO_NAME),
+                        help="The screen name for our hero player. Default: " + config.get('DEFAULT',HERO_NAME))
+    parser.add_argument('-t','--timezone', action="store",dest="timezone",default=config.get('DEFAULT',TIMEZONE_TEXT),
+                        help=("Timezone specification for hand history times. In form \"Asia/Macau\". " +
+                                " For list see https://en.wikipedia.org/wiki/List_of_tz_database_time_zones. " +
+                                "Default: " + config.get('DEFAULT',TIMEZONE_TEXT) )
+                       )
+    parser.add_argument('file', type=argparse.FileType('r'), nargs='*',help="plain text files of Poker Mavens hand histories to process.")
+    args = parser.parse_args()
+
+    lastHandTime = datetime.datetime.now()
+    heroPlayer = args.player
+
+    currency = args.currency
+    if (len(currency) != 3):
+        print("Currency code must have three characters. Defaulting back to " + DEFAULT_CURRENCY)
+        currency = DEFAULT_CURRENCY
+
+    timezone = pytz.timezone(args.timezone)
+    utc = pytz.utc
+
+    numArg = len(args.file)
+    if (numArg == 0):
+        print("Must provide a name of a log file to process.")
+    else:
+        # process each file listed on the command line
+        # first loop through is just to parse and get each hand separated, and get basic hand
+        # info into the hands dictionary
+        # basic hand info is hand number, local hand number, hand time, and table
+        # everything else goes into TEXT
+        # each file is read in one go and split into hands by parseFile
+        # the files are taken in command line order so a hand repeated in a later file replaces
+        # the earlier copy
+        allFileHands = [parseFile(fh.name) for fh in args.file]
+
+        # the hand text is kept only in the hands dictionary, and each file is reduced to a list of
+        # (hand time, hand number) records used to put the hands in order
+        # so once a hand is popped from hands and converted nothing else holds on to its text
+        fileOrders = []
+        for fileHands in allFileHands:
+            fileOrder = []
+            for handNumber, handTime, tableName, handText in fileHands:
+                fileOrder.append((handTime, handNumber))
+                hands[handNumber] = {
+                                   DATETIME: handTime,
+                                   TEXT: handText}
+                if (tableName is not None):
+                    tableName = sys.intern(tableName)
+                    if (not tableName in tables):
+                        tables[tableName] = {COUNT: 0, LATEST: "", OHH:[] }
+                        tables[tableName][HANDLE] = str(zlib.crc32(tableName.encode('utf-8')))
+                    hands[handNumber][TABLE] = tableName
+            # a log is normally already in time order so this sort is close to a single pass
+            fileOrder.sort(key=lambda fileRecord: fileRecord[0])
+            fileOrders.append(fileOrder)
+        del allFileHands, fileHands
+
+        handNumber = ""
+        handTime = datetime.datetime.now()
+
+        # now that we have all hands from all the files,
+        # use the timestamps of the imported hands to process them in chronological order
+        # this is the place for processing the text of each hand and look for player actions
+        # each file's hands are in time order, so merging those lists gives all hands in time order
+        # without sorting everything again
+        # when a hand number appears in more than one file, the hands dictionary holds the copy from
+        # the last of those files, and that is the copy converted
+        # so a record is only used if its time is the time of that copy, which puts the hand where the
+        # old sort over the hands dictionary put it; records for other copies are skipped
+        # if several copies share that time the first one to come out of the merge is used
+        # each hand is taken out of the hands dictionary as it is parsed so its text can be released
+        for handTime, handNumber in heapq.merge(*fileOrders, key=lambda fileRecord: fileRecord[0]):
+            hand = hands.get(handNumber)
+            if (hand is None or hand[DATETIME] != handTime):
+                continue
+            del hands[handNumber]
+
+            # Get important hand and table header info and put hand time in the YYYY-mm-ddThh:mm:ssZ ISO
+            # format that is expected by the OHH spec
+            # being sure to reference back to the timezone as specified in command line
+            # or configuration files
+            # the fixed format is built directly from the fields rather than through strftime
+            handTime = timezone.localize(hand[DATETIME])
+            utcTime = handTime.astimezone(utc)
+            handTimeUtc = (f"{utcTime.year:04d}-{utcTime.month:02d}-{utcTime.day:02d}"
+                           f"T{utcTime.hour:02d}:{utcTime.minute:02d}:{utcTime.second:02d}Z")
+            # print(handNumber) #DEBUG
+            table = hand[TABLE]
+            tables[table][COUNT] += 1
+            tables[table][LATEST] = handTime
+            tables[table][LAST] = handNumber
+            lastHandTime = handTime
+            # print(handTime) # DEBUG
+
+            ohh = parseHand(handNumber, handTimeUtc, table, hand[TEXT], heroPlayer, currency)
+            tables[table][OHH].append(ohh)
+
+
+        # finally step through each table and produce an output file
+        # with one OHH JSON object on a line
+        # separated from one another by empty lines as specified by PT4 for import
+        # UNLESS the -i or --indent flag was used in which case the JSON for
+        # each OHH object will be indented for ease of reading and debugging
+        for table in tables.keys():
+            print("Table: " + table + " Processed hands:" +str(tables[table][COUNT]))
+            print("\tLatest: " + tables[table][LATEST].strftime("%T %m/%d/%Y"))
+            fileName = (config.get('DEFAULT',PREFIX) + tables[table][LATEST].strftime("-%Y-%m-%d-") +
+                         RE_FILENAME_CHARS.sub('_', table) + ".ohh")
+            f = open(fileName, "wb")
+            for ohh in tables[table][OHH]:
+                wrapped_ohh = {}
+                wrapped_ohh[OHH] = ohh
+                f.write(dumpOhh(wrapped_ohh, args.indent))
+                f.write(b"\n")
+                f.write(b"\n")
+
+            f.close()
+
+# end of functions
+#
+#######################################################################################################################
 
-        f.close()
+if __name__ == '__main__':
+    main()